@@ -4,6 +4,9 @@ __all__ = [
     "config",
     "rss",
     "article",
+    "http_client",
+    "near_duplicates",
+    "semantic_cache",
     "storage",
     "summarizer",
     "notifier",
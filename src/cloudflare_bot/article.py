@@ -3,54 +3,186 @@
 from __future__ import annotations
 
 import logging
-from typing import Optional
+import re
+import threading
+from typing import Dict, List, Optional, Tuple, Union
 
+import lxml.html
 import requests
-from bs4 import BeautifulSoup
+from lxml.etree import ParserError
+
+from . import http_client, storage
 
 LOGGER = logging.getLogger(__name__)
 
+# Only the page up to the end of the article body is parsed; anything after it
+# (inline SVGs, scripts, related posts) is not worth parsing. The rest is still
+# read so the keep-alive connection returns to the pool; only pathological
+# pages larger than this cap are cut off mid-stream.
+MAX_HTML_BYTES = 512 * 1024
+_ARTICLE_END = b"</article>"
+
+# (connect, read) timeouts: fail fast on unreachable hosts, but give a slow
+# page time to stream.
+DEFAULT_TIMEOUT = (5, 30)
+
+# Pages without a charset in either the HTTP header or a <meta> tag are
+# decoded as UTF-8 instead of libxml2's Latin-1 default.
+DEFAULT_ENCODING = "utf-8"
+_META_CHARSET = re.compile(rb"<meta[^>]+charset", re.I)
+_META_SNIFF_BYTES = 4096
+
+# lxml parsers must not be shared between threads, so each worker keeps its own
+_PARSER_TLS = threading.local()
+
+
+def fetch_article_html(
+    url: str,
+    timeout: Union[float, Tuple[float, float]] = DEFAULT_TIMEOUT,
+    cache_path: Optional[str] = None,
+) -> Tuple[bytes, Optional[str]]:
+    """Download the raw HTML for a blog post, up to the end of its ``<article>``.
+
+    Returns the undecoded body together with the charset from the
+    ``Content-Type`` header, if it named one. With ``cache_path``, pages are
+    revalidated with a conditional GET and served from the database on
+    ``304 Not Modified``.
+    """
+
+    cached = storage.get_cached_page(cache_path, url) if cache_path else None
+    headers = {}
+    if cached:
+        etag, last_modified, _body, _encoding = cached
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+
+    with http_client.get_session().get(
+        url, headers=headers, timeout=timeout, stream=True
+    ) as response:
+        if cached and response.status_code == 304:
+            return cached[2], cached[3]
+        response.raise_for_status()
+        body = _read_article_body(response)
+        encoding = _header_encoding(response)
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+
+    # Without validators the page could never be revalidated, so skip caching it
+    if cache_path and (etag or last_modified):
+        storage.save_cached_page(cache_path, url, etag, last_modified, body, encoding)
+    return body, encoding
+
+
+def _header_encoding(response: requests.Response) -> Optional[str]:
+    """Return the charset named in the ``Content-Type`` header, if any.
+
+    ``get_encoding_from_headers`` reports ISO-8859-1 for any ``text/*`` type
+    without a charset, so it is only consulted when one is present.
+    """
+
+    if "charset" not in response.headers.get("Content-Type", "").lower():
+        return None
+    return requests.utils.get_encoding_from_headers(response.headers)
+
+
+def _read_article_body(response: requests.Response, limit: int = MAX_HTML_BYTES) -> bytes:
+    """Read up to ``limit`` bytes and return them up to the first ``</article>``."""
+
+    buffer = bytearray()
+    for chunk in response.iter_content(chunk_size=64 * 1024):
+        buffer.extend(chunk)
+        if len(buffer) >= limit:
+            del buffer[limit:]
+            break
+    end = buffer.find(_ARTICLE_END)
+    if end != -1:
+        del buffer[end + len(_ARTICLE_END) :]
+    return bytes(buffer)
+
+
+def extract_main_text(html: Union[str, bytes], encoding: Optional[str] = None) -> str:
+    """Extract readable article text from a Cloudflare Blog HTML page.
+
+    Byte input is decoded with ``encoding`` (normally the HTTP header
+    charset), else the page's ``<meta charset>``, else UTF-8.
+    """
+
+    if isinstance(html, bytes):
+        encoding = _resolve_encoding(html, encoding)
+        try:
+            parser = _parser(encoding)
+        except LookupError:
+            # libxml2 does not know this charset; fall back to the page's <meta>
+            parser = _parser(_resolve_encoding(html, None))
+    else:
+        parser = _parser()
+    try:
+        tree = lxml.html.fromstring(html, parser=parser)
+    except ParserError:
+        return ""
+
+    containers = tree.xpath("//article") or tree.xpath("//main")
+    root = containers[0] if containers else tree
+    nodes = root.xpath(".//p | .//li")
 
-def fetch_article_html(url: str, timeout: int = 20) -> str:
-    """Download the raw HTML for a blog post."""
+    # Fallback to any paragraph content if the article tag did not produce text
+    paragraphs = _collect_text(nodes) or _collect_text(tree.xpath("//p"))
+    return "\n\n".join(paragraphs)
 
-    response = requests.get(url, timeout=timeout)
-    response.raise_for_status()
-    return response.text
 
+def _resolve_encoding(html: bytes, encoding: Optional[str]) -> Optional[str]:
+    """Return the encoding to force on the parser, or ``None`` to honour ``<meta>``."""
+
+    # The header name is passed through as-is: libxml2 knows "euc-kr", but not
+    # Python's normalised codec names such as "euc_kr"
+    if encoding:
+        return encoding
+    if _META_CHARSET.search(html, 0, _META_SNIFF_BYTES):
+        return None
+    return DEFAULT_ENCODING
 
-def extract_main_text(html: str) -> str:
-    """Extract readable article text from a Cloudflare Blog HTML page."""
 
-    soup = BeautifulSoup(html, "html.parser")
-    article_tag = soup.find("article") or soup.find("main") or soup
+def _parser(encoding: Optional[str] = None) -> lxml.html.HTMLParser:
+    """Return the current thread's HTML parser for ``encoding``."""
+
+    parsers: Optional[Dict[Optional[str], lxml.html.HTMLParser]] = getattr(
+        _PARSER_TLS, "parsers", None
+    )
+    if parsers is None:
+        parsers = _PARSER_TLS.parsers = {}
+    parser = parsers.get(encoding)
+    if parser is None:
+        parser = parsers[encoding] = lxml.html.HTMLParser(encoding=encoding)
+    return parser
+
+
+def _collect_text(nodes: List[lxml.html.HtmlElement]) -> List[str]:
+    """Return the stripped, non-empty text content of ``nodes``."""
 
     paragraphs = []
-    for element in article_tag.find_all(["p", "li"]):
-        text = element.get_text(strip=True)
+    for node in nodes:
+        text = node.text_content().strip()
         if text:
             paragraphs.append(text)
-
-    # Fallback to any paragraph content if the article tag did not produce text
-    if not paragraphs:
-        for element in soup.find_all("p"):
-            text = element.get_text(strip=True)
-            if text:
-                paragraphs.append(text)
-
-    return "\n\n".join(paragraphs)
+    return paragraphs
 
 
-def get_article_text(url: str, timeout: int = 20) -> Optional[str]:
+def get_article_text(
+    url: str,
+    timeout: Union[float, Tuple[float, float]] = DEFAULT_TIMEOUT,
+    cache_path: Optional[str] = None,
+) -> Optional[str]:
     """Convenience helper to retrieve and extract article text."""
 
     try:
-        html = fetch_article_html(url, timeout=timeout)
+        html, encoding = fetch_article_html(url, timeout=timeout, cache_path=cache_path)
     except requests.RequestException as exc:  # pragma: no cover - network failure
         LOGGER.warning("Failed to download article %s: %s", url, exc)
         return None
 
-    text = extract_main_text(html)
+    text = extract_main_text(html, encoding)
     if not text:
         LOGGER.warning("No textual content extracted from %s", url)
         return None
@@ -12,6 +12,11 @@ from dotenv import load_dotenv
 DEFAULT_FEED_URL = "https://blog.cloudflare.com/rss/"
 DEFAULT_DATABASE_PATH = "cloudflare_blog.db"
 DEFAULT_INITIAL_SUMMARY_LIMIT = 5
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_LLM_CONCURRENCY = 4
+DEFAULT_SEMANTIC_CACHE_THRESHOLD = 0.92
+DEFAULT_SUMMARY_CACHE_TTL_SECONDS = 30 * 24 * 3600
+DEFAULT_NEAR_DUPLICATE_THRESHOLD = 0.0
 
 load_dotenv()
 
@@ -29,6 +34,18 @@ class Settings:
     llm_message_key: str = "messages"
     wecom_webhook: Optional[str] = None
     initial_summary_limit: int = DEFAULT_INITIAL_SUMMARY_LIMIT
+    max_workers: int = DEFAULT_MAX_WORKERS
+    llm_concurrency: int = DEFAULT_LLM_CONCURRENCY
+    semantic_cache_path: Optional[str] = None
+    semantic_cache_threshold: float = DEFAULT_SEMANTIC_CACHE_THRESHOLD
+    summary_cache_ttl_seconds: int = DEFAULT_SUMMARY_CACHE_TTL_SECONDS
+    near_duplicate_threshold: float = DEFAULT_NEAR_DUPLICATE_THRESHOLD
+
+    @property
+    def llm_configured(self) -> bool:
+        """Whether an OpenAI key or custom LLM endpoint is available."""
+
+        return bool(self.openai_api_key or self.llm_api_url)
 
     @classmethod
     def from_env(cls) -> "Settings":
@@ -46,6 +63,18 @@ class Settings:
             initial_summary_limit=_get_int(
                 "CF_BLOG_INITIAL_SUMMARY_LIMIT", DEFAULT_INITIAL_SUMMARY_LIMIT
             ),
+            max_workers=_get_int("CF_BLOG_MAX_WORKERS", DEFAULT_MAX_WORKERS),
+            llm_concurrency=_get_int("CF_BLOG_LLM_CONCURRENCY", DEFAULT_LLM_CONCURRENCY),
+            semantic_cache_path=os.getenv("CF_BLOG_SEMANTIC_CACHE"),
+            semantic_cache_threshold=_get_float(
+                "CF_BLOG_SEMANTIC_THRESHOLD", DEFAULT_SEMANTIC_CACHE_THRESHOLD
+            ),
+            summary_cache_ttl_seconds=_get_int(
+                "CF_BLOG_SUMMARY_CACHE_TTL", DEFAULT_SUMMARY_CACHE_TTL_SECONDS
+            ),
+            near_duplicate_threshold=_get_float(
+                "CF_BLOG_NEAR_DUPLICATE_THRESHOLD", DEFAULT_NEAR_DUPLICATE_THRESHOLD
+            ),
         )
 
 
@@ -60,3 +89,15 @@ def _get_int(var_name: str, default: int) -> int:
     except ValueError:
         return default
     return max(0, value)
+
+
+def _get_float(var_name: str, default: float) -> float:
+    """Read a float environment variable, falling back to ``default``."""
+
+    raw_value = os.getenv(var_name)
+    if raw_value is None:
+        return default
+    try:
+        return float(raw_value)
+    except ValueError:
+        return default
@@ -0,0 +1,67 @@
+"""Shared HTTP session used for all outbound requests made by the bot."""
+
+from __future__ import annotations
+
+import atexit
+import threading
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+USER_AGENT = "cloudflare-rss-bot/1.0"
+DEFAULT_HEADERS = {
+    "Accept-Encoding": "gzip, deflate",
+    "User-Agent": USER_AGENT,
+}
+
+# Distinct hosts kept in the pool, and connections kept alive per host
+DEFAULT_POOL_HOSTS = 16
+DEFAULT_POOL_SIZE = 32
+
+_SESSION: Optional[requests.Session] = None
+_SESSION_LOCK = threading.Lock()
+
+
+def create_session(pool_size: int = DEFAULT_POOL_SIZE) -> requests.Session:
+    """Create a session with connection pooling and retry on transient errors."""
+
+    session = requests.Session()
+    session.headers.update(DEFAULT_HEADERS)
+    _mount_adapters(session, pool_size)
+    return session
+
+
+def get_session() -> requests.Session:
+    """Return the process-wide session, creating it on first use."""
+
+    global _SESSION
+    if _SESSION is None:
+        with _SESSION_LOCK:
+            if _SESSION is None:
+                _SESSION = create_session()
+                atexit.register(_SESSION.close)
+    return _SESSION
+
+
+def configure(pool_size: int) -> None:
+    """Size the shared connection pool for ``pool_size`` concurrent requests.
+
+    Without this, workers beyond the default pool size open connections that
+    are discarded instead of kept alive once their request finishes.
+    """
+
+    _mount_adapters(get_session(), max(DEFAULT_POOL_SIZE, pool_size))
+
+
+def _mount_adapters(session: requests.Session, pool_size: int) -> None:
+    """Mount pooled, retrying adapters for HTTP and HTTPS on ``session``."""
+
+    adapter = HTTPAdapter(
+        pool_connections=DEFAULT_POOL_HOSTS,
+        pool_maxsize=pool_size,
+        max_retries=Retry(total=3, backoff_factor=0.3),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
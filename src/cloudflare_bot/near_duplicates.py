@@ -0,0 +1,111 @@
+"""MinHash index that detects republished copies of already summarised posts."""
+
+from __future__ import annotations
+
+import functools
+import logging
+import threading
+from typing import TYPE_CHECKING, Any, Dict, Iterator, Optional, Tuple
+
+from . import storage
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from datasketch import LeanMinHash
+
+LOGGER = logging.getLogger(__name__)
+
+NUM_PERMUTATIONS = 64
+SHINGLE_SIZE = 5
+
+
+class NearDuplicateIndex:
+    """LSH index of the MinHash signatures of stored, summarised articles.
+
+    Signatures are stored in the ``articles.sig`` column, so the index is
+    rebuilt from the database on every run.
+    """
+
+    def __init__(self, path: str, threshold: float) -> None:
+        self._datasketch = _load_datasketch()
+        self._lsh = self._datasketch.MinHashLSH(threshold=threshold, num_perm=NUM_PERMUTATIONS)
+        self._summaries: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        for article_id, signature, summary in storage.get_article_signatures(path):
+            self._insert(article_id, _from_bytes(signature), summary)
+
+    @classmethod
+    def open(cls, path: str, threshold: float) -> Optional["NearDuplicateIndex"]:
+        """Return an index for the database at ``path``, or ``None`` if disabled."""
+
+        if threshold <= 0:
+            return None
+        if _load_datasketch() is None:
+            LOGGER.warning("Near-duplicate detection disabled: install datasketch")
+            return None
+        try:
+            return cls(path, threshold)
+        except ValueError as exc:
+            # MinHashLSH rejects thresholds above 1.0, and at 64 permutations
+            # also those too close to 1.0 to split into several bands
+            LOGGER.warning(
+                "Near-duplicate detection disabled: invalid threshold %s (%s)", threshold, exc
+            )
+            return None
+
+    def signature(self, content: str) -> bytes:
+        """Return the serialised MinHash signature of ``content``."""
+
+        minhash = self._datasketch.MinHash(num_perm=NUM_PERMUTATIONS)
+        minhash.update_batch([shingle.encode("utf-8") for shingle in _shingles(content)])
+        lean = self._datasketch.LeanMinHash(minhash)
+        buffer = bytearray(lean.bytesize())
+        lean.serialize(buffer)
+        return bytes(buffer)
+
+    def lookup(self, signature: bytes) -> Optional[Tuple[str, str]]:
+        """Return ``(article_id, summary)`` of a stored near-duplicate, if any."""
+
+        with self._lock:
+            for article_id in self._lsh.query(_from_bytes(signature)):
+                return article_id, self._summaries[article_id]
+        return None
+
+    def add(self, article_id: str, signature: bytes, summary: str) -> None:
+        """Index ``article_id`` so later copies of it reuse ``summary``."""
+
+        with self._lock:
+            self._insert(article_id, _from_bytes(signature), summary)
+
+    def _insert(self, article_id: str, minhash: "LeanMinHash", summary: str) -> None:
+        if article_id in self._summaries:
+            return
+        self._lsh.insert(article_id, minhash)
+        self._summaries[article_id] = summary
+
+
+def _shingles(content: str) -> Iterator[str]:
+    """Yield overlapping :data:`SHINGLE_SIZE`-word shingles of ``content``."""
+
+    words = content.lower().split()
+    if len(words) <= SHINGLE_SIZE:
+        yield " ".join(words)
+        return
+    for start in range(len(words) - SHINGLE_SIZE + 1):
+        yield " ".join(words[start : start + SHINGLE_SIZE])
+
+
+def _from_bytes(signature: bytes) -> "LeanMinHash":
+    """Rebuild a MinHash from :meth:`NearDuplicateIndex.signature` output."""
+
+    return _load_datasketch().LeanMinHash.deserialize(bytearray(signature))
+
+
+@functools.cache
+def _load_datasketch() -> Any:
+    """Import datasketch (and with it numpy and scipy) only once detection is enabled."""
+
+    try:  # pragma: no cover - optional dependency
+        import datasketch
+    except Exception:  # pragma: no cover - optional dependency
+        return None
+    return datasketch
@@ -2,11 +2,17 @@
 
 from __future__ import annotations
 
-from typing import Optional
+import logging
+import queue
+import threading
+from typing import Optional, Tuple
 
+import orjson
 import requests
 
-from . import summarizer
+from . import http_client, summarizer
+
+LOGGER = logging.getLogger(__name__)
 
 
 class NotificationError(RuntimeError):
@@ -43,8 +49,73 @@ def send_wecom_message(
             "content": markdown_content,
         },
     }
-    response = requests.post(webhook_url, json=payload, timeout=10)
-    if response.status_code != 200 or response.json().get("errcode") != 0:
+    response = http_client.get_session().post(
+        webhook_url,
+        data=orjson.dumps(payload),
+        headers={"Content-Type": "application/json"},
+        timeout=10,
+    )
+    if not response.ok:
         raise NotificationError(
             f"Failed to send notification: {response.status_code} {response.text}"
         )
+
+    try:
+        data = orjson.loads(response.content)
+    except orjson.JSONDecodeError as exc:
+        raise NotificationError(f"Invalid webhook response: {response.text}") from exc
+    if not isinstance(data, dict):
+        raise NotificationError(f"Invalid webhook response: {response.text}")
+    if data.get("errcode") != 0:
+        raise NotificationError(
+            f"Failed to send notification: errcode={data.get('errcode')} {data.get('errmsg', '')}"
+        )
+
+
+_Message = Tuple[summarizer.Brief, str, str, Optional[str]]
+
+
+class NotificationQueue:
+    """Deliver WeCom messages from a background thread in submission order.
+
+    Callers only enqueue messages, so the webhook round trip stays off their
+    critical path. Leaving the ``with`` block waits until every queued message
+    has been sent.
+    """
+
+    def __init__(self) -> None:
+        self._queue: "queue.Queue[Optional[_Message]]" = queue.Queue()
+        self._thread = threading.Thread(
+            target=self._run, name="wecom-notifier", daemon=True
+        )
+
+    def __enter__(self) -> "NotificationQueue":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._queue.put(None)
+        self._thread.join()
+
+    def submit(
+        self,
+        brief: summarizer.Brief,
+        title: str,
+        link: str,
+        webhook_url: Optional[str],
+    ) -> None:
+        """Queue a message for :func:`send_wecom_message`."""
+
+        self._queue.put((brief, title, link, webhook_url))
+
+    def _run(self) -> None:
+        while True:
+            message = self._queue.get()
+            if message is None:
+                return
+            try:
+                send_wecom_message(*message)
+            except (NotificationError, requests.RequestException) as exc:
+                LOGGER.error("Failed to send notification for %s: %s", message[2], exc)
+            except Exception:  # noqa: BLE001 - this thread must outlive any single message
+                LOGGER.exception("Failed to send notification for %s", message[2])
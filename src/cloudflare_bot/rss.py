@@ -2,11 +2,28 @@
 
 from __future__ import annotations
 
+import io
+import itertools
+import re
 from dataclasses import dataclass
-from datetime import datetime
-from typing import Iterable, List
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import AbstractSet, Callable, Iterable, Iterator, List, Optional
 
-import feedparser
+import lxml.html
+import requests
+from lxml import etree
+
+from . import http_client
+
+ATOM_NS = "http://www.w3.org/2005/Atom"
+DC_NS = "http://purl.org/dc/elements/1.1/"
+
+_XML_DECLARATION = re.compile(r"^\s*<\?xml[^>]*\?>")
+
+
+class FeedError(RuntimeError):
+    """Raised when the feed cannot be downloaded or parsed."""
 
 
 @dataclass(slots=True)
@@ -17,38 +34,202 @@ class FeedEntry:
     title: str
     link: str
     published: datetime
+    summary: str = ""
+
+
+@dataclass(slots=True)
+class FeedDocument:
+    """Raw feed body together with its HTTP cache validators."""
+
+    content: bytes
+    etag: Optional[str]
+    last_modified: Optional[str]
+
+
+def fetch_feed(
+    feed_url: str,
+    etag: Optional[str] = None,
+    last_modified: Optional[str] = None,
+    timeout: int = 20,
+) -> Optional[FeedDocument]:
+    """Download the feed with a conditional GET.
+
+    Returns ``None`` when the server answers ``304 Not Modified`` for the given
+    ``etag``/``last_modified`` validators.
+    """
+
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+
+    try:
+        response = http_client.get_session().get(feed_url, headers=headers, timeout=timeout)
+        if response.status_code == 304:
+            return None
+        response.raise_for_status()
+    except requests.RequestException as exc:
+        raise FeedError(f"Failed to download feed {feed_url}: {exc}") from exc
+
+    return FeedDocument(
+        content=response.content,
+        etag=response.headers.get("ETag"),
+        last_modified=response.headers.get("Last-Modified"),
+    )
+
+
+def parse_feed_document(content: bytes) -> Iterator[FeedEntry]:
+    """Lazily parse an RSS 2.0 or Atom document into feed entries.
+
+    Elements are parsed incrementally and discarded once converted, so only
+    the entry being yielded is held in memory. Invalid XML raises
+    :class:`FeedError` while iterating.
+    """
+
+    atom_entry = f"{{{ATOM_NS}}}entry"
+    events = etree.iterparse(
+        io.BytesIO(content),
+        events=("end",),
+        tag=("item", atom_entry),
+        resolve_entities=False,
+        no_network=True,
+    )
+    parse_atom, parse_rss = _parse_atom_entry, _parse_rss_item
+    try:
+        for _event, item in events:
+            entry = parse_atom(item) if item.tag == atom_entry else parse_rss(item)
+            # Drop the element and its already processed siblings
+            item.clear()
+            getprevious, parent = item.getprevious, item.getparent()
+            while getprevious() is not None:
+                del parent[0]
+            if entry:
+                yield entry
+    except etree.XMLSyntaxError as exc:
+        raise FeedError(f"Invalid feed document: {exc}") from exc
 
 
-def parse_feed(feed_url: str) -> List[FeedEntry]:
-    """Fetch and parse the RSS feed, returning the most recent entries."""
-
-    parsed = feedparser.parse(feed_url)
-    entries: List[FeedEntry] = []
-    for entry in parsed.entries:
-        published = _normalise_published(entry)
-        entries.append(
-            FeedEntry(
-                id=getattr(entry, "id", entry.link),
-                title=entry.title,
-                link=entry.link,
-                published=published,
-            )
+def _parse_rss_item(item: etree._Element) -> Optional[FeedEntry]:
+    """Convert an RSS ``<item>`` element into a :class:`FeedEntry`."""
+
+    link = _text(item, "link")
+    if not link:
+        return None
+    published = _parse_rfc822(_text(item, "pubDate")) or _parse_iso(
+        _text(item, f"{{{DC_NS}}}date")
+    )
+    return FeedEntry(
+        id=_text(item, "guid") or link,
+        title=_text(item, "title"),
+        link=link,
+        published=published or datetime.utcnow(),
+        summary=_plain_text(_text(item, "description")),
+    )
+
+
+def _parse_atom_entry(item: etree._Element) -> Optional[FeedEntry]:
+    """Convert an Atom ``<entry>`` element into a :class:`FeedEntry`."""
+
+    link = ""
+    for element in item.iterfind(f"{{{ATOM_NS}}}link"):
+        if element.get("rel", "alternate") == "alternate" and element.get("href"):
+            link = element.get("href").strip()
+            break
+    if not link:
+        return None
+    published = _parse_iso(_text(item, f"{{{ATOM_NS}}}published")) or _parse_iso(
+        _text(item, f"{{{ATOM_NS}}}updated")
+    )
+    return FeedEntry(
+        id=_text(item, f"{{{ATOM_NS}}}id") or link,
+        title=_text(item, f"{{{ATOM_NS}}}title"),
+        link=link,
+        published=published or datetime.utcnow(),
+        summary=_plain_text(
+            _text(item, f"{{{ATOM_NS}}}summary") or _text(item, f"{{{ATOM_NS}}}content")
+        ),
+    )
+
+
+def _text(element: etree._Element, tag: str) -> str:
+    """Return the stripped text of the first ``tag`` child of ``element``."""
+
+    return (element.findtext(tag) or "").strip()
+
+
+def _plain_text(html: str) -> str:
+    """Strip markup from an HTML feed description.
+
+    Paragraphs and list items are joined with blank lines, as in
+    :func:`cloudflare_bot.article.extract_main_text`.
+    """
+
+    if not html:
+        return ""
+    # lxml refuses str input that carries an encoding declaration
+    html = _XML_DECLARATION.sub("", html, count=1)
+    try:
+        root = lxml.html.fromstring(html)
+    except (etree.ParserError, ValueError):
+        return html
+    blocks = [
+        text
+        for text in (
+            node.text_content().strip()
+            for node in root.xpath("descendant-or-self::p | descendant-or-self::li")
         )
-    return entries
+        if text
+    ]
+    return "\n\n".join(blocks) if blocks else root.text_content().strip()
+
+
+def _parse_rfc822(value: str) -> Optional[datetime]:
+    """Parse an RSS ``pubDate`` into a naive UTC ``datetime``."""
+
+    if not value:
+        return None
+    try:
+        return _to_naive_utc(parsedate_to_datetime(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_iso(value: str) -> Optional[datetime]:
+    """Parse an ISO 8601 timestamp into a naive UTC ``datetime``."""
+
+    if not value:
+        return None
+    try:
+        return _to_naive_utc(datetime.fromisoformat(value))
+    except ValueError:
+        return None
+
 
+def _to_naive_utc(value: datetime) -> datetime:
+    """Normalise ``value`` to UTC without tzinfo, matching stored timestamps."""
 
-def _normalise_published(entry: feedparser.FeedParserDict) -> datetime:
-    """Convert the RSS published metadata into a ``datetime`` object."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
 
-    if hasattr(entry, "published_parsed") and entry.published_parsed:
-        return datetime(*entry.published_parsed[:6])
-    if hasattr(entry, "updated_parsed") and entry.updated_parsed:
-        return datetime(*entry.updated_parsed[:6])
-    return datetime.utcnow()
 
+def filter_new_entries(
+    entries: Iterable[FeedEntry],
+    unknown_ids: Callable[[List[str]], AbstractSet[str]],
+    batch_size: int = 500,
+) -> Iterator[FeedEntry]:
+    """Yield feed entries whose IDs are not stored yet.
 
-def filter_new_entries(entries: Iterable[FeedEntry], existing_ids: Iterable[str]) -> List[FeedEntry]:
-    """Return feed entries that do not already exist in the provided IDs."""
+    ``unknown_ids`` receives the IDs of ``batch_size`` entries at a time and
+    returns those that are not stored, such as
+    :func:`cloudflare_bot.storage.filter_unknown_ids`.
+    """
 
-    existing = set(existing_ids)
-    return [entry for entry in entries if entry.id not in existing]
+    iterator = iter(entries)
+    while True:
+        batch = list(itertools.islice(iterator, batch_size))
+        if not batch:
+            return
+        unknown = unknown_ids([entry.id for entry in batch])
+        yield from (entry for entry in batch if entry.id in unknown)
@@ -0,0 +1,138 @@
+"""Embedding-based cache that reuses briefs for near-identical articles."""
+
+from __future__ import annotations
+
+import functools
+import logging
+import threading
+from pathlib import Path
+from typing import Any, List, Optional, Tuple
+
+import orjson
+
+from .summarizer import Brief
+
+LOGGER = logging.getLogger(__name__)
+
+DEFAULT_EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+DEFAULT_SIMILARITY_THRESHOLD = 0.92
+
+
+class SemanticCache:
+    """FAISS inner-product index of article embeddings and their briefs.
+
+    Embeddings are L2-normalised, so the inner product equals the cosine
+    similarity. The index is stored at ``path`` and the briefs next to it in
+    ``<path>.json``.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        threshold: float = DEFAULT_SIMILARITY_THRESHOLD,
+        model_name: str = DEFAULT_EMBEDDING_MODEL,
+    ) -> None:
+        self.path = Path(path)
+        self.threshold = threshold
+        self._briefs_path = self.path.with_name(self.path.name + ".json")
+        faiss, np, sentence_transformer = _load_dependencies()
+        self._faiss = faiss
+        self._np = np
+        self._model = sentence_transformer(model_name)
+        self._lock = threading.Lock()
+        self._index: Any = None
+        self._briefs: List[Brief] = []
+        self._dirty = False
+        self._load()
+
+    @classmethod
+    def open(
+        cls,
+        path: Optional[str],
+        threshold: float = DEFAULT_SIMILARITY_THRESHOLD,
+    ) -> Optional["SemanticCache"]:
+        """Return a cache for ``path``, or ``None`` if it cannot be used."""
+
+        if not path:
+            return None
+        if _load_dependencies() is None:
+            LOGGER.warning(
+                "Semantic cache disabled: install sentence-transformers and faiss-cpu"
+            )
+            return None
+        return cls(path, threshold=threshold)
+
+    def embed(self, content: str) -> Any:
+        """Return the normalised embedding for ``content``."""
+
+        vector = self._model.encode([content], normalize_embeddings=True)
+        return self._np.asarray(vector, dtype="float32")
+
+    def lookup(self, embedding: Any) -> Optional[Brief]:
+        """Return the cached brief most similar to ``embedding`` above the threshold."""
+
+        with self._lock:
+            if self._index is None or self._index.ntotal == 0:
+                return None
+            scores, positions = self._index.search(embedding, 1)
+        score, position = float(scores[0][0]), int(positions[0][0])
+        if position < 0 or score < self.threshold:
+            return None
+        LOGGER.info("Semantic cache hit (similarity %.3f)", score)
+        return self._briefs[position]
+
+    def add(self, embedding: Any, brief: Brief) -> None:
+        """Remember ``brief`` for articles similar to ``embedding``."""
+
+        with self._lock:
+            if self._index is None:
+                self._index = self._faiss.IndexFlatIP(embedding.shape[1])
+            self._index.add(embedding)
+            self._briefs.append(brief)
+            self._dirty = True
+
+    def save(self) -> None:
+        """Persist the index and briefs if anything was added."""
+
+        with self._lock:
+            if not self._dirty or self._index is None:
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._faiss.write_index(self._index, str(self.path))
+            payload = [
+                {"category": brief.category, "summary": brief.summary}
+                for brief in self._briefs
+            ]
+            self._briefs_path.write_bytes(orjson.dumps(payload))
+            self._dirty = False
+
+    def _load(self) -> None:
+        """Load a previously saved index, ignoring it if it is inconsistent."""
+
+        if not self.path.exists() or not self._briefs_path.exists():
+            return
+        index = self._faiss.read_index(str(self.path))
+        data = orjson.loads(self._briefs_path.read_bytes())
+        briefs = [Brief(category=item["category"], summary=item["summary"]) for item in data]
+        if index.ntotal != len(briefs):
+            LOGGER.warning("Ignoring semantic cache at %s: index and briefs differ", self.path)
+            return
+        self._index = index
+        self._briefs = briefs
+
+
+@functools.cache
+def _load_dependencies() -> Optional[Tuple[Any, Any, type]]:
+    """Import faiss, numpy and sentence-transformers on first use.
+
+    sentence-transformers pulls in torch, so it is only imported once a cache
+    path is configured.
+    """
+
+    try:  # pragma: no cover - optional dependency
+        import faiss
+        import numpy as np
+        from sentence_transformers import SentenceTransformer
+    except Exception:  # pragma: no cover - optional dependency
+        return None
+    return faiss, np, SentenceTransformer
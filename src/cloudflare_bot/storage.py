@@ -2,12 +2,15 @@
 
 from __future__ import annotations
 
+import itertools
 import sqlite3
+import time
+import zlib
 from contextlib import contextmanager
 from dataclasses import dataclass
 from datetime import datetime
 from pathlib import Path
-from typing import Iterable, Iterator, Optional
+from typing import Iterable, Iterator, List, Optional, Sequence, Set, Tuple
 
 
 @dataclass(slots=True)
@@ -19,6 +22,7 @@ class ArticleRecord:
     link: str
     published: datetime
     summary_zh: Optional[str]
+    signature: Optional[bytes] = None
 
 
 SCHEMA = """
@@ -28,20 +32,57 @@ CREATE TABLE IF NOT EXISTS articles (
     link TEXT NOT NULL,
     published TEXT NOT NULL,
     summary_zh TEXT,
-    created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP
+    created_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP,
+    sig BLOB
+);
+
+-- Lets the first sync pick the newest unsummarised articles without a sort
+CREATE INDEX IF NOT EXISTS idx_articles_pending
+    ON articles (published DESC) WHERE summary_zh IS NULL;
+
+CREATE TABLE IF NOT EXISTS feed_meta (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT
+);
+
+CREATE TABLE IF NOT EXISTS llm_cache (
+    key TEXT PRIMARY KEY,
+    response TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS http_cache (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    encoding TEXT,
+    body_gz BLOB NOT NULL,
+    fetched_at INTEGER NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS summary_cache (
+    key TEXT PRIMARY KEY,
+    category TEXT NOT NULL,
+    summary TEXT NOT NULL,
+    created_at INTEGER NOT NULL
 );
 """
 
 
 @contextmanager
 def connect(path: str) -> Iterator[sqlite3.Connection]:
-    """Context manager returning a SQLite connection with foreign keys enabled."""
+    """Context manager returning a SQLite connection with foreign keys enabled.
+
+    ``synchronous=NORMAL`` is safe in the WAL mode selected by
+    :func:`initialize_database` and avoids an fsync on every commit.
+    """
 
     db_path = Path(path)
     db_path.parent.mkdir(parents=True, exist_ok=True)
     connection = sqlite3.connect(db_path)
     try:
         connection.execute("PRAGMA foreign_keys = ON;")
+        connection.execute("PRAGMA synchronous = NORMAL;")
         yield connection
     finally:
         connection.commit()
@@ -52,31 +93,272 @@ def initialize_database(path: str) -> None:
     """Create the necessary database tables if they do not exist."""
 
     with connect(path) as conn:
+        # The journal mode is stored in the database file, so setting it once is enough
+        conn.execute("PRAGMA journal_mode = WAL;")
         conn.executescript(SCHEMA)
+        # Columns added after the tables were first created
+        _ensure_column(conn, "articles", "sig", "BLOB")
+        _ensure_column(conn, "http_cache", "encoding", "TEXT")
+
+
+def _ensure_column(conn: sqlite3.Connection, table: str, column: str, declaration: str) -> None:
+    """Add ``column`` to ``table`` in databases created without it."""
+
+    columns = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+    if column not in columns:
+        conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {declaration}")
+
+
+def has_articles(path: str) -> bool:
+    """Return whether any article has been stored yet."""
+
+    with connect(path) as conn:
+        return conn.execute("SELECT 1 FROM articles LIMIT 1").fetchone() is not None
+
+
+INSERT_ARTICLE = """
+INSERT OR REPLACE INTO articles (id, title, link, published, summary_zh, sig)
+VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+
+# Stay below SQLite's default limit of 999 bound parameters per statement
+_ID_LOOKUP_CHUNK_SIZE = 500
+
+
+def get_existing_ids(path: str, ids: Sequence[str]) -> Set[str]:
+    """Return which of ``ids`` are stored in the database."""
+
+    existing: Set[str] = set()
+    with connect(path) as conn:
+        for start in range(0, len(ids), _ID_LOOKUP_CHUNK_SIZE):
+            chunk = ids[start : start + _ID_LOOKUP_CHUNK_SIZE]
+            placeholders = ", ".join("?" * len(chunk))
+            existing.update(
+                row[0]
+                for row in conn.execute(
+                    f"SELECT id FROM articles WHERE id IN ({placeholders})", chunk
+                )
+            )
+    return existing
+
+
+def filter_unknown_ids(path: str, ids: Sequence[str]) -> Set[str]:
+    """Return which of ``ids`` are not stored in the database yet.
+
+    The lookup runs against the primary-key index, so the stored IDs never
+    have to be loaded into Python.
+    """
+
+    return set(ids) - get_existing_ids(path, ids)
+
+
+def save_articles(path: str, articles: Iterable[ArticleRecord]) -> None:
+    """Persist several processed articles in a single transaction."""
+
+    articles = list(articles)
+    with connect(path) as conn:
+        conn.execute("BEGIN")
+        conn.executemany(INSERT_ARTICLE, (_article_row(article) for article in articles))
+        # A page is only worth caching until its article has been stored
+        conn.executemany(
+            "DELETE FROM http_cache WHERE url = ?", ((article.link,) for article in articles)
+        )
+
+
+ARCHIVE_CHUNK_SIZE = 100
+
+
+def archive_articles(
+    path: str, articles: Iterable[ArticleRecord], chunk_size: int = ARCHIVE_CHUNK_SIZE
+) -> None:
+    """Bulk-insert articles that are not stored yet, leaving existing rows untouched.
+
+    Rows are inserted with one multi-row ``INSERT`` per ``chunk_size`` articles,
+    which avoids the per-row statement reset of ``executemany`` on large
+    backfills. The default keeps each statement below SQLite's limit of 999
+    bound parameters.
+    """
+
+    rows = (_article_row(article) for article in articles)
+    with connect(path) as conn:
+        conn.execute("BEGIN")
+        try:
+            while True:
+                chunk = list(itertools.islice(rows, chunk_size))
+                if not chunk:
+                    break
+                placeholders = ", ".join(["(?, ?, ?, ?, ?, ?)"] * len(chunk))
+                conn.execute(
+                    "INSERT OR IGNORE INTO articles "
+                    "(id, title, link, published, summary_zh, sig) "
+                    f"VALUES {placeholders}",
+                    list(itertools.chain.from_iterable(chunk)),
+                )
+        except BaseException:
+            # ``articles`` may be a feed stream that fails part-way; archive all or nothing
+            conn.rollback()
+            raise
+
+
+def _article_row(article: ArticleRecord) -> tuple:
+    """Return the ``articles`` row parameters for ``article``."""
+
+    return (
+        article.id,
+        article.title,
+        article.link,
+        article.published.isoformat(),
+        article.summary_zh,
+        article.signature,
+    )
+
+
+def get_pending_summary_ids(path: str, limit: int) -> List[str]:
+    """Return the IDs of the newest ``limit`` stored articles without a summary."""
+
+    with connect(path) as conn:
+        rows = conn.execute(
+            """
+            SELECT id FROM articles
+            WHERE summary_zh IS NULL
+            ORDER BY published DESC
+            LIMIT ?
+            """,
+            (limit,),
+        ).fetchall()
+    return [row[0] for row in rows]
+
+
+def delete_unsummarised(path: str, ids: Sequence[str]) -> None:
+    """Delete those of ``ids`` that are still stored without a summary."""
+
+    with connect(path) as conn:
+        for start in range(0, len(ids), _ID_LOOKUP_CHUNK_SIZE):
+            chunk = ids[start : start + _ID_LOOKUP_CHUNK_SIZE]
+            placeholders = ", ".join("?" * len(chunk))
+            conn.execute(
+                f"DELETE FROM articles WHERE summary_zh IS NULL AND id IN ({placeholders})",
+                chunk,
+            )
+
+
+def get_article_signatures(path: str) -> Iterator[Tuple[str, bytes, str]]:
+    """Yield ``(id, signature, summary_zh)`` for summarised articles with a signature."""
+
+    with connect(path) as conn:
+        yield from conn.execute(
+            "SELECT id, sig, summary_zh FROM articles "
+            "WHERE sig IS NOT NULL AND summary_zh IS NOT NULL"
+        )
+
+
+def get_feed_meta(path: str, url: str) -> Tuple[Optional[str], Optional[str]]:
+    """Return the stored ``(etag, last_modified)`` validators for a feed."""
+
+    with connect(path) as conn:
+        row = conn.execute(
+            "SELECT etag, last_modified FROM feed_meta WHERE url = ?", (url,)
+        ).fetchone()
+    return (row[0], row[1]) if row else (None, None)
+
+
+def set_feed_meta(
+    path: str, url: str, etag: Optional[str], last_modified: Optional[str]
+) -> None:
+    """Store the HTTP cache validators returned for a feed."""
+
+    with connect(path) as conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO feed_meta (url, etag, last_modified) VALUES (?, ?, ?)",
+            (url, etag, last_modified),
+        )
+
+
+# Pages of articles that were never stored (skipped or failed) are kept this long
+HTTP_CACHE_MAX_AGE_SECONDS = 7 * 24 * 3600
+
+
+def prune_http_cache(path: str, max_age: int = HTTP_CACHE_MAX_AGE_SECONDS) -> None:
+    """Delete cached pages fetched more than ``max_age`` seconds ago."""
+
+    with connect(path) as conn:
+        conn.execute(
+            "DELETE FROM http_cache WHERE fetched_at < ?", (int(time.time()) - max_age,)
+        )
+
+
+def get_cached_page(
+    path: str, url: str
+) -> Optional[Tuple[Optional[str], Optional[str], bytes, Optional[str]]]:
+    """Return the cached ``(etag, last_modified, body, encoding)`` of a downloaded page."""
+
+    with connect(path) as conn:
+        row = conn.execute(
+            "SELECT etag, last_modified, body_gz, encoding FROM http_cache WHERE url = ?",
+            (url,),
+        ).fetchone()
+    return (row[0], row[1], zlib.decompress(row[2]), row[3]) if row else None
+
+
+def save_cached_page(
+    path: str,
+    url: str,
+    etag: Optional[str],
+    last_modified: Optional[str],
+    body: bytes,
+    encoding: Optional[str] = None,
+) -> None:
+    """Store a downloaded page with its HTTP cache validators and charset."""
+
+    with connect(path) as conn:
+        conn.execute(
+            """
+            INSERT OR REPLACE INTO http_cache
+                (url, etag, last_modified, encoding, body_gz, fetched_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+            """,
+            (url, etag, last_modified, encoding, zlib.compress(body, 3), int(time.time())),
+        )
+
+
+def get_cached_response(path: str, key: str) -> Optional[str]:
+    """Return the cached LLM response stored under ``key``, if any."""
+
+    with connect(path) as conn:
+        row = conn.execute("SELECT response FROM llm_cache WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else None
+
+
+def save_cached_response(path: str, key: str, response: str) -> None:
+    """Store an LLM response under ``key``."""
+
+    with connect(path) as conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO llm_cache (key, response) VALUES (?, ?)",
+            (key, response),
+        )
 
 
-def get_known_ids(path: str) -> Iterable[str]:
-    """Return the IDs of articles that already exist in storage."""
+def get_cached_brief(path: str, key: str, max_age: int) -> Optional[Tuple[str, str]]:
+    """Return the cached ``(category, summary)`` for ``key`` if younger than ``max_age`` seconds."""
 
     with connect(path) as conn:
-        cursor = conn.execute("SELECT id FROM articles")
-        return [row[0] for row in cursor.fetchall()]
+        row = conn.execute(
+            "SELECT category, summary FROM summary_cache WHERE key = ? AND created_at >= ?",
+            (key, int(time.time()) - max_age),
+        ).fetchone()
+    return (row[0], row[1]) if row else None
 
 
-def save_article(path: str, article: ArticleRecord) -> None:
-    """Persist a processed article to the database."""
+def save_cached_brief(path: str, key: str, category: str, summary: str) -> None:
+    """Store a generated brief under ``key``."""
 
     with connect(path) as conn:
         conn.execute(
             """
-            INSERT OR REPLACE INTO articles (id, title, link, published, summary_zh)
-            VALUES (?, ?, ?, ?, ?)
+            INSERT OR REPLACE INTO summary_cache (key, category, summary, created_at)
+            VALUES (?, ?, ?, ?)
             """,
-            (
-                article.id,
-                article.title,
-                article.link,
-                article.published.isoformat(),
-                article.summary_zh,
-            ),
+            (key, category, summary, int(time.time())),
         )
@@ -2,17 +2,51 @@
 
 from __future__ import annotations
 
+import functools
+import hashlib
 import os
+import random
 import re
+import time
 from dataclasses import dataclass
-from typing import Any, Optional
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Iterator, Optional
 
+import orjson
 import requests
 
+from . import http_client, storage
+
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from .semantic_cache import SemanticCache
+
 try:  # pragma: no cover - optional dependency
-    from openai import OpenAI
+    import ahocorasick
 except Exception:  # pragma: no cover - optional dependency
-    OpenAI = None  # type: ignore
+    ahocorasick = None  # type: ignore
+
+_SENT_SPLIT = re.compile(r"(?<=[。！？])\s+")
+_CATEGORY_RE = re.compile(r"类别[：:]\s*([\w\u4e00-\u9fff]+)")
+_SUMMARY_RE = re.compile(r"摘要[：:](.*)", re.S)
+
+# Ordered (keywords, category) pairs for the fallback categoriser; keywords are
+# lower-cased once here so they can be matched against lower-cased text.
+_HEURISTICS: tuple[tuple[tuple[str, ...], str], ...] = tuple(
+    (tuple(keyword.lower() for keyword in keywords), category)
+    for keywords, category in (
+        (("security", "vulnerability", "漏洞", "攻击"), "安全更新"),
+        (("tutorial", "guide", "how to", "指南", "教程"), "技术分享"),
+        (("beta", "launch", "new", "update", "发布", "上线"), "功能更新"),
+        (("report", "trend", "analysis", "洞察", "报告"), "趋势洞察"),
+        (("event", "webinar", "conference", "活动", "峰会"), "活动预告"),
+    )
+)
+_DEFAULT_CATEGORY = "新闻"
+
+# Rate-limited LLM requests (HTTP 429/503) are retried with exponential
+# backoff, honouring the server's Retry-After header when it sends one.
+LLM_MAX_RETRIES = 4
+_RETRY_STATUSES = frozenset({429, 503})
+_RETRY_MAX_DELAY = 30.0
 
 
 @dataclass(slots=True)
@@ -41,8 +75,26 @@ def generate_brief(
     custom_api_key: Optional[str] = None,
     custom_model: Optional[str] = None,
     custom_message_key: str = "messages",
+    cache_path: Optional[str] = None,
+    semantic_cache: Optional["SemanticCache"] = None,
+    summary_cache_ttl: int = 0,
 ) -> Brief:
-    """Generate a concise Chinese brief for the article."""
+    """Generate a concise Chinese brief for the article.
+
+    When ``cache_path`` points at the article database, LLM completions are
+    cached there by model and prompt so re-processing an article is free. With
+    a positive ``summary_cache_ttl`` (seconds) the finished brief is also
+    cached by title and content, so identical articles skip prompt building
+    and every LLM lookup. A ``semantic_cache`` additionally reuses the brief
+    of a previously summarised article whose content is nearly identical.
+    """
+
+    brief_key = None
+    if cache_path and summary_cache_ttl > 0:
+        brief_key = _brief_cache_key(title, content)
+        cached_brief = storage.get_cached_brief(cache_path, brief_key, summary_cache_ttl)
+        if cached_brief:
+            return Brief(category=cached_brief[0], summary=cached_brief[1])
 
     # Prefer LLM if credentials are provided
     prompt = (
@@ -60,29 +112,55 @@ def generate_brief(
     custom_model_name = custom_model or os.getenv("LLM_MODEL") or model
     message_key = custom_message_key or os.getenv("LLM_MESSAGE_KEY") or "messages"
 
+    embedding = None
+    if semantic_cache is not None and (custom_url or (api_key and _load_openai() is not None)):
+        embedding = semantic_cache.embed(content[:6000])
+        cached = semantic_cache.lookup(embedding)
+        if cached:
+            return cached
+
+    def _remember(brief: Brief) -> Brief:
+        # Only LLM briefs are cached; heuristic fallbacks should be retried
+        if embedding is not None:
+            semantic_cache.add(embedding, brief)
+        if brief_key:
+            storage.save_cached_brief(cache_path, brief_key, brief.category, brief.summary)
+        return brief
+
     if custom_url:
-        completion = _call_custom_llm(
-            prompt,
-            custom_url,
-            custom_key,
+        parsed = _complete_with_cache(
+            cache_path,
             custom_model_name,
-            message_key,
-        )
-        if completion:
-            parsed = _parse_structured_brief(completion)
-            if parsed:
-                return parsed
-
-    if api_key and OpenAI is not None:
-        client = OpenAI(api_key=api_key)
-        response = client.responses.create(
-            model=model,
-            input=[{"role": "user", "content": prompt}],
+            prompt,
+            lambda: _call_custom_llm(
+                prompt,
+                custom_url,
+                custom_key,
+                custom_model_name,
+                message_key,
+            ),
         )
-        completion = response.output_text.strip()
-        parsed = _parse_structured_brief(completion)
         if parsed:
-            return parsed
+            return _remember(parsed)
+
+    if api_key and _load_openai() is not None:
+
+        def _call_openai() -> Optional[str]:
+            client = _openai_client(api_key)
+            with client.responses.stream(
+                model=model,
+                input=[{"role": "user", "content": prompt}],
+            ) as stream:
+                completion = _accumulate_until_json(
+                    event.delta
+                    for event in stream
+                    if event.type == "response.output_text.delta"
+                )
+            return completion.strip()
+
+        parsed = _complete_with_cache(cache_path, model, prompt, _call_openai)
+        if parsed:
+            return _remember(parsed)
 
     # Fallback heuristic summarisation if no API key is available
     sentences = _split_sentences(content)
@@ -95,10 +173,75 @@ def generate_brief(
     return Brief(category=category, summary=preview)
 
 
+@functools.cache
+def _load_openai() -> Optional[type]:
+    """Import the OpenAI client class on first use.
+
+    The SDK pulls in httpx and pydantic, so it is only imported when an OpenAI
+    key is configured and the custom endpoint did not produce a brief.
+    """
+
+    try:  # pragma: no cover - optional dependency
+        from openai import OpenAI
+    except Exception:  # pragma: no cover - optional dependency
+        return None
+    return OpenAI
+
+
+@functools.cache
+def _openai_client(api_key: str) -> Any:
+    """Return the shared OpenAI client for ``api_key``.
+
+    Reusing one client keeps its HTTP connection pool, and with it the TLS
+    session to the API, alive across summaries. The client is thread-safe.
+    """
+
+    # The SDK backs off on rate limits itself and honours Retry-After
+    return _load_openai()(api_key=api_key, max_retries=LLM_MAX_RETRIES)
+
+
+def _complete_with_cache(
+    cache_path: Optional[str],
+    model: str,
+    prompt: str,
+    call: Callable[[], Optional[str]],
+) -> Optional[Brief]:
+    """Return a brief for ``prompt``, serving the completion from cache if possible."""
+
+    key = _cache_key(model, prompt) if cache_path else None
+    if key:
+        cached = storage.get_cached_response(cache_path, key)
+        if cached:
+            parsed = _parse_structured_brief(cached)
+            if parsed:
+                return parsed
+
+    completion = call()
+    if not completion:
+        return None
+    parsed = _parse_structured_brief(completion)
+    # Only cache completions that produced a usable brief
+    if parsed and key:
+        storage.save_cached_response(cache_path, key, completion)
+    return parsed
+
+
+def _cache_key(model: str, prompt: str) -> str:
+    """Return the content-addressed cache key for a model/prompt pair."""
+
+    return hashlib.blake2b(f"{model}\0{prompt}".encode("utf-8")).hexdigest()
+
+
+def _brief_cache_key(title: str, content: str) -> str:
+    """Return the cache key identifying an article by its title and content."""
+
+    return hashlib.blake2b(f"{title}\0{content}".encode("utf-8"), digest_size=16).hexdigest()
+
+
 def _split_sentences(text: str) -> list[str]:
     """Split text into sentences by punctuation for the fallback summariser."""
 
-    parts = re.split(r"(?<=[。！？])\s+", text)
+    parts = _SENT_SPLIT.split(text)
     return [part.strip() for part in parts if part.strip()]
 
 
@@ -121,8 +264,8 @@ def _parse_structured_brief(text: str) -> Optional[Brief]:
             return brief
 
     # Fallback heuristic parsing when LLM returns plain text
-    category_match = re.search(r"类别[：:]\s*([\w\u4e00-\u9fff]+)", text)
-    summary_match = re.search(r"摘要[：:](.*)", text, re.S)
+    category_match = _CATEGORY_RE.search(text)
+    summary_match = _SUMMARY_RE.search(text)
     category = category_match.group(1).strip() if category_match else ""
     summary = summary_match.group(1).strip() if summary_match else text.strip()
     if category and summary:
@@ -133,19 +276,17 @@ def _parse_structured_brief(text: str) -> Optional[Brief]:
 def _loads_json_safely(text: str) -> Any:
     """Load JSON while being tolerant to stray characters."""
 
-    import json
-
     cleaned = text.strip()
     try:
-        return json.loads(cleaned)
-    except json.JSONDecodeError:
+        return orjson.loads(cleaned)
+    except orjson.JSONDecodeError:
         # Attempt to trim leading/trailing noise
         start = cleaned.find("{")
         end = cleaned.rfind("}")
         if start != -1 and end != -1 and start < end:
             try:
-                return json.loads(cleaned[start : end + 1])
-            except json.JSONDecodeError:
+                return orjson.loads(cleaned[start : end + 1])
+            except orjson.JSONDecodeError:
                 return None
     return None
 
@@ -173,21 +314,74 @@ def _normalise_summary(text: str) -> str:
     return cleaned.strip()
 
 
+def _build_category_automaton(cased: bool) -> Any:
+    """Build an Aho-Corasick automaton mapping keywords to (priority, category).
+
+    ``cased`` selects the keywords that have letter case (matched against the
+    lower-cased text) or the case-invariant ones, such as Chinese keywords,
+    that can be matched against the original text.
+    """
+
+    if ahocorasick is None:
+        return None
+    automaton = ahocorasick.Automaton()
+    for priority, (keywords, category) in enumerate(_HEURISTICS):
+        for keyword in keywords:
+            if _is_cased(keyword) != cased:
+                continue
+            # Earlier heuristics win when the same keyword appears twice
+            if keyword not in automaton:
+                automaton.add_word(keyword, (priority, category))
+    if len(automaton) == 0:
+        return None
+    automaton.make_automaton()
+    return automaton
+
+
+def _is_cased(keyword: str) -> bool:
+    """Return whether ``keyword`` changes under case conversion."""
+
+    return keyword.lower() != keyword.upper()
+
+
+_CASED_AUTOMATON = _build_category_automaton(cased=True)
+_UNCASED_AUTOMATON = _build_category_automaton(cased=False)
+
+
 def _infer_category(title: str, content: str) -> str:
     """Infer a best-effort category when no LLM is available."""
 
-    text = f"{title}\n{content[:600]}".lower()
-    heuristics = [
-        (("security", "vulnerability", "漏洞", "攻击"), "安全更新"),
-        (("tutorial", "guide", "how to", "指南", "教程"), "技术分享"),
-        (("beta", "launch", "new", "update", "发布", "上线"), "功能更新"),
-        (("report", "trend", "analysis", "洞察", "报告"), "趋势洞察"),
-        (("event", "webinar", "conference", "活动", "峰会"), "活动预告"),
-    ]
-    for keywords, category in heuristics:
+    text = f"{title}\n{content[:600]}"
+    if ahocorasick is not None:
+        # The earliest heuristic with a match wins, exactly as with the ordered
+        # substring scan below. Case-invariant keywords are matched on the
+        # original text, so the lower-cased copy is only built when they did
+        # not already settle on the highest-priority category.
+        best = _best_category_match(_UNCASED_AUTOMATON, text, None)
+        if best is None or best[0] > 0:
+            best = _best_category_match(_CASED_AUTOMATON, text.lower(), best)
+        return best[1] if best else _DEFAULT_CATEGORY
+
+    text = text.lower()
+    for keywords, category in _HEURISTICS:
         if any(keyword in text for keyword in keywords):
             return category
-    return "新闻"
+    return _DEFAULT_CATEGORY
+
+
+def _best_category_match(
+    automaton: Any, text: str, best: Optional[tuple[int, str]]
+) -> Optional[tuple[int, str]]:
+    """Return the highest-priority ``(priority, category)`` match in ``text``."""
+
+    if automaton is None:
+        return best
+    for _end, match in automaton.iter(text):
+        if best is None or match[0] < best[0]:
+            best = match
+            if best[0] == 0:
+                break
+    return best
 
 
 def _call_custom_llm(
@@ -203,25 +397,91 @@ def _call_custom_llm(
     if api_key:
         headers["Authorization"] = f"Bearer {api_key}"
 
-    payload: dict[str, Any] = {"model": model, message_key: [{"role": "user", "content": prompt}]}
+    payload: dict[str, Any] = {
+        "model": model,
+        message_key: [{"role": "user", "content": prompt}],
+        "stream": True,
+    }
 
     try:
-        response = requests.post(api_url, headers=headers, json=payload, timeout=30)
-        response.raise_for_status()
+        with _post_with_backoff(
+            api_url, headers=headers, data=orjson.dumps(payload), timeout=30, stream=True
+        ) as response:
+            response.raise_for_status()
+            # Endpoints that ignore "stream" answer with a single JSON document
+            if "text/event-stream" in response.headers.get("Content-Type", ""):
+                completion = _accumulate_until_json(_iter_stream_deltas(response))
+            else:
+                completion = _extract_text_from_response(orjson.loads(response.content))
     except requests.RequestException:
         return None
-
-    try:
-        data = response.json()
-    except ValueError:
+    except orjson.JSONDecodeError:
         return None
 
-    completion = _extract_text_from_response(data)
     if completion:
         return completion.strip()
     return None
 
 
+def _post_with_backoff(url: str, **kwargs: Any) -> requests.Response:
+    """POST ``url``, retrying rate-limited responses up to :data:`LLM_MAX_RETRIES` times."""
+
+    session = http_client.get_session()
+    for attempt in range(LLM_MAX_RETRIES):
+        response = session.post(url, **kwargs)
+        if response.status_code not in _RETRY_STATUSES:
+            return response
+        delay = _retry_delay(response, attempt)
+        response.close()
+        time.sleep(delay)
+    return session.post(url, **kwargs)
+
+
+def _retry_delay(response: requests.Response, attempt: int) -> float:
+    """Return how long to wait before retrying a rate-limited request."""
+
+    retry_after = response.headers.get("Retry-After", "")
+    if retry_after.isdigit():
+        return min(float(retry_after), _RETRY_MAX_DELAY)
+    # Full jitter keeps concurrent workers from retrying in lockstep
+    return random.uniform(0, min(2.0**attempt, _RETRY_MAX_DELAY))
+
+
+def _iter_stream_deltas(response: requests.Response) -> Iterator[str]:
+    """Yield the text deltas of a server-sent-events chat completion stream."""
+
+    for line in response.iter_lines():
+        if not line.startswith(b"data:"):
+            continue
+        data = line[len(b"data:") :].strip()
+        if data == b"[DONE]":
+            break
+        try:
+            chunk = orjson.loads(data)
+        except orjson.JSONDecodeError:
+            continue
+        text = _extract_text_from_response(chunk)
+        if text:
+            yield text
+
+
+def _accumulate_until_json(deltas: Iterable[str]) -> str:
+    """Join streamed text, stopping as soon as it holds a complete JSON object.
+
+    The prompt asks for a single JSON object, so anything streamed after it
+    is not needed and the rest of the response is not waited for.
+    """
+
+    parts: list[str] = []
+    for delta in deltas:
+        parts.append(delta)
+        if "}" in delta:
+            text = "".join(parts)
+            if isinstance(_loads_json_safely(text), dict):
+                return text
+    return "".join(parts)
+
+
 def _extract_text_from_response(data: Any) -> Optional[str]:
     """Extract assistant text from a generic chat completion response."""
 
@@ -2,26 +2,173 @@
 
 from __future__ import annotations
 
+import itertools
 import logging
-from typing import Iterable, Sequence, Tuple
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, Iterable, Iterator, Optional
 
-from cloudflare_bot import article, config, notifier, rss, storage, summarizer
+from cloudflare_bot import config, http_client, rss, storage
+
+# The remaining modules pull in the LLM client, HTML and optional similarity
+# libraries; they are imported where needed so that a run which finds the
+# feed unchanged skips loading them entirely.
+if TYPE_CHECKING:  # pragma: no cover - typing only
+    from cloudflare_bot import near_duplicates, notifier, semantic_cache
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s %(message)s")
 LOGGER = logging.getLogger(__name__)
 
+# Feed excerpts at least this long are summarised directly instead of
+# downloading the full article.
+FEED_SUMMARY_MIN_LENGTH = 400
+
+# Processed records are flushed to SQLite in batches of this size
+SAVE_BATCH_SIZE = 32
+
+
+@dataclass(slots=True)
+class ProcessingStats:
+    """Outcome counts of a :func:`process_entries` run."""
+
+    processed: int = 0
+    skipped: int = 0
+    failed: int = 0
+
+    @property
+    def complete(self) -> bool:
+        """Whether every entry was stored, so none needs another attempt."""
+
+        return not (self.skipped or self.failed)
 
-def process_entries(entries: Iterable[rss.FeedEntry], settings: config.Settings) -> None:
-    """Process RSS entries, persisting new ones and notifying WeCom."""
 
-    for entry in entries:
-        LOGGER.info("Processing entry: %s", entry.title)
-        content = article.get_article_text(entry.link)
-        if not content:
-            LOGGER.warning("Skipping %s due to missing content", entry.link)
+def process_entries(
+    entries: Iterable[rss.FeedEntry], settings: config.Settings
+) -> ProcessingStats:
+    """Process RSS entries, persisting new ones and notifying WeCom.
+
+    Entries are handled concurrently, with at most
+    ``settings.llm_concurrency`` summaries requested at once so downloads can
+    run ahead of the rate-limited LLM. The resulting records are written to
+    the database in batches of :data:`SAVE_BATCH_SIZE`. Entries that are
+    skipped or fail are not stored and are counted in the returned stats.
+    """
+
+    from cloudflare_bot import near_duplicates, notifier, semantic_cache
+
+    brief_cache = semantic_cache.SemanticCache.open(
+        settings.semantic_cache_path, threshold=settings.semantic_cache_threshold
+    )
+    duplicates = near_duplicates.NearDuplicateIndex.open(
+        settings.database_path, settings.near_duplicate_threshold
+    )
+    llm_slots = threading.BoundedSemaphore(max(1, settings.llm_concurrency))
+    with notifier.NotificationQueue() as notifications, ThreadPoolExecutor(
+        max_workers=max(1, settings.max_workers)
+    ) as executor:
+        futures: Dict[Future, rss.FeedEntry] = {}
+        try:
+            for entry in entries:
+                future = executor.submit(
+                    _process_one,
+                    entry,
+                    settings,
+                    brief_cache,
+                    duplicates,
+                    llm_slots,
+                    notifications,
+                )
+                futures[future] = entry
+        finally:
+            # ``entries`` may raise FeedError part-way through a truncated feed;
+            # entries already submitted are announced, so they must be stored too.
+            stats = _store_results(futures, settings)
+
+    if brief_cache is not None:
+        brief_cache.save()
+    return stats
+
+
+def _store_results(
+    futures: Dict[Future, rss.FeedEntry], settings: config.Settings
+) -> ProcessingStats:
+    """Wait for ``futures`` and save their records in batches of :data:`SAVE_BATCH_SIZE`."""
+
+    LOGGER.info("Summarising %d new entries", len(futures))
+    records = []
+    stats = ProcessingStats()
+    for future in as_completed(futures):
+        entry = futures[future]
+        try:
+            record = future.result()
+        except Exception:  # noqa: BLE001 - one failing entry must not stop the run
+            LOGGER.exception("Failed to process %s", entry.link)
+            stats.failed += 1
+            continue
+        if record is None:
+            stats.skipped += 1
             continue
+        stats.processed += 1
+        records.append(record)
+        if len(records) >= SAVE_BATCH_SIZE:
+            storage.save_articles(settings.database_path, records)
+            records.clear()
+
+    if records:
+        storage.save_articles(settings.database_path, records)
+    if futures:
+        LOGGER.info(
+            "Processed %d entries (%d skipped, %d failed)",
+            stats.processed,
+            stats.skipped,
+            stats.failed,
+        )
+    return stats
+
+
+def _process_one(
+    entry: rss.FeedEntry,
+    settings: config.Settings,
+    brief_cache: Optional[semantic_cache.SemanticCache],
+    duplicates: Optional[near_duplicates.NearDuplicateIndex],
+    llm_slots: threading.Semaphore,
+    notifications: notifier.NotificationQueue,
+) -> Optional[storage.ArticleRecord]:
+    """Summarise and announce a single entry, returning the record to store.
+
+    Republished copies of an already summarised article reuse its summary
+    and are not announced again.
+    """
+
+    from cloudflare_bot import summarizer
+
+    LOGGER.debug("Processing entry: %s", entry.title)
+    content = load_content(entry, settings)
+    if not content:
+        LOGGER.warning("Skipping %s due to missing content", entry.link)
+        return None
 
-        model_name = settings.llm_model or "gpt-4o-mini"
+    signature = None
+    if duplicates is not None:
+        signature = duplicates.signature(content)
+        duplicate = duplicates.lookup(signature)
+        if duplicate is not None:
+            original_id, summary_text = duplicate
+            LOGGER.info(
+                "%s is a near-duplicate of %s, reusing its summary", entry.link, original_id
+            )
+            return storage.ArticleRecord(
+                id=entry.id,
+                title=entry.title,
+                link=entry.link,
+                published=entry.published,
+                summary_zh=summary_text,
+                signature=signature,
+            )
+
+    model_name = settings.llm_model or "gpt-4o-mini"
+    with llm_slots:
         brief = summarizer.generate_brief(
             entry.title,
             content,
@@ -31,26 +178,44 @@ def process_entries(entries: Iterable[rss.FeedEntry], settings: config.Settings)
             custom_api_key=settings.llm_api_key,
             custom_model=settings.llm_model,
             custom_message_key=settings.llm_message_key,
+            cache_path=settings.database_path,
+            semantic_cache=brief_cache,
+            summary_cache_ttl=settings.summary_cache_ttl_seconds,
         )
-        summary_text = brief.format_plaintext(entry.title)
-        record = storage.ArticleRecord(
-            id=entry.id,
-            title=entry.title,
-            link=entry.link,
-            published=entry.published,
-            summary_zh=summary_text,
-        )
-        storage.save_article(settings.database_path, record)
+    summary_text = brief.format_plaintext(entry.title)
+    record = storage.ArticleRecord(
+        id=entry.id,
+        title=entry.title,
+        link=entry.link,
+        published=entry.published,
+        summary_zh=summary_text,
+        signature=signature,
+    )
+    if duplicates is not None:
+        duplicates.add(entry.id, signature, summary_text)
 
-        try:
-            notifier.send_wecom_message(
-                brief,
-                entry.title,
-                entry.link,
-                settings.wecom_webhook,
-            )
-        except notifier.NotificationError as exc:
-            LOGGER.error("Failed to send notification for %s: %s", entry.link, exc)
+    notifications.submit(brief, entry.title, entry.link, settings.wecom_webhook)
+    return record
+
+
+def load_content(entry: rss.FeedEntry, settings: config.Settings) -> Optional[str]:
+    """Return the text to summarise for ``entry``.
+
+    The feed excerpt is used as-is when no LLM is configured (the fallback
+    summariser only needs a preview) or when it is long enough for the LLM;
+    otherwise the full article is downloaded, falling back to the excerpt if
+    that fails.
+    """
+
+    from cloudflare_bot import article
+
+    if entry.summary and (
+        not settings.llm_configured or len(entry.summary) >= FEED_SUMMARY_MIN_LENGTH
+    ):
+        return entry.summary
+
+    text = article.get_article_text(entry.link, cache_path=settings.database_path)
+    return text or entry.summary or None
 
 
 def persist_entries_without_summary(
@@ -58,56 +223,101 @@ def persist_entries_without_summary(
 ) -> None:
     """Persist entries without generating summaries or sending notifications."""
 
-    for entry in entries:
-        LOGGER.info("Storing entry without summary: %s", entry.title)
-        record = storage.ArticleRecord(
-            id=entry.id,
-            title=entry.title,
-            link=entry.link,
-            published=entry.published,
-            summary_zh=None,
-        )
-        storage.save_article(settings.database_path, record)
+    count = 0
+
+    def _records() -> Iterator[storage.ArticleRecord]:
+        nonlocal count
+        # Bound once: this loop runs for every entry of a long backfill
+        record, debug = storage.ArticleRecord, LOGGER.debug
+        for entry in entries:
+            debug("Storing entry without summary: %s", entry.title)
+            count += 1
+            yield record(
+                id=entry.id,
+                title=entry.title,
+                link=entry.link,
+                published=entry.published,
+                summary_zh=None,
+            )
 
+    storage.archive_articles(settings.database_path, _records())
+    if count:
+        LOGGER.info("Persisted %d entries without summaries", count)
 
-def split_initial_entries(
-    entries: Sequence[rss.FeedEntry],
-    limit: int,
-) -> Tuple[Sequence[rss.FeedEntry], Sequence[rss.FeedEntry]]:
-    """Return entries that should be summarised and those only persisted."""
 
-    if limit <= 0:
-        return (), entries
+def summarise_initial_entries(content: bytes, settings: config.Settings) -> ProcessingStats:
+    """Summarise the newest entries archived by the first sync.
 
-    sorted_entries = sorted(entries, key=lambda entry: entry.published, reverse=True)
-    to_summarise = sorted_entries[:limit]
-    to_archive = sorted_entries[limit:]
-    return to_summarise, to_archive
+    The entries are picked in SQL and then re-read from the feed ``content``
+    so their excerpts are available. Any that end up without a summary are
+    removed again, so the next run retries them as new entries.
+    """
 
+    pending_ids = storage.get_pending_summary_ids(
+        settings.database_path, settings.initial_summary_limit
+    )
+    wanted = set(pending_ids)
+    try:
+        return process_entries(
+            (entry for entry in rss.parse_feed_document(content) if entry.id in wanted),
+            settings,
+        )
+    finally:
+        storage.delete_unsummarised(settings.database_path, pending_ids)
 
 
 def main() -> None:
     settings = config.Settings.from_env()
     storage.initialize_database(settings.database_path)
+    storage.prune_http_cache(settings.database_path)
+    http_client.configure(pool_size=settings.max_workers)
 
-    entries = rss.parse_feed(settings.feed_url)
-    known_ids = storage.get_known_ids(settings.database_path)
-    new_entries = rss.filter_new_entries(entries, known_ids)
-    LOGGER.info("Found %d new entries", len(new_entries))
+    etag, last_modified = storage.get_feed_meta(settings.database_path, settings.feed_url)
+    try:
+        document = rss.fetch_feed(settings.feed_url, etag=etag, last_modified=last_modified)
+        if document is None:
+            LOGGER.info("Feed not modified since the last run")
+            return
+        entries = rss.parse_feed_document(document.content)
+        first_entry = next(entries, None)
+    except rss.FeedError as exc:
+        LOGGER.error("%s", exc)
+        return
 
-    if not known_ids and new_entries:
-        to_process, to_store_only = split_initial_entries(
-            new_entries, settings.initial_summary_limit
+    if first_entry is None:
+        LOGGER.info("Feed contains no entries")
+        storage.set_feed_meta(
+            settings.database_path, settings.feed_url, document.etag, document.last_modified
         )
-        if to_store_only:
-            LOGGER.info(
-                "Initial sync: persisting %d additional entries without summaries",
-                len(to_store_only),
-            )
-            persist_entries_without_summary(to_store_only, settings)
-        process_entries(to_process, settings)
         return
-    process_entries(new_entries, settings)
+
+    initial_sync = not storage.has_articles(settings.database_path)
+    new_entries = rss.filter_new_entries(
+        itertools.chain([first_entry], entries),
+        lambda ids: storage.filter_unknown_ids(settings.database_path, ids),
+    )
+
+    try:
+        if initial_sync:
+            # Archive the whole backlog, then summarise only the newest posts
+            persist_entries_without_summary(new_entries, settings)
+            stats = summarise_initial_entries(document.content, settings)
+        else:
+            stats = process_entries(new_entries, settings)
+    except rss.FeedError as exc:
+        # Raised while streaming the rest of the document
+        LOGGER.error("%s", exc)
+        return
+
+    # Only remember the validators once every entry is stored, so a run that
+    # skipped or failed entries is retried against the full feed instead of
+    # receiving a 304.
+    if not stats.complete:
+        LOGGER.info("Not storing feed validators: some entries will be retried")
+        return
+    storage.set_feed_meta(
+        settings.database_path, settings.feed_url, document.etag, document.last_modified
+    )
 
 
 if __name__ == "__main__":  # pragma: no cover - script entrypoint